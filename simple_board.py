@@ -12,6 +12,41 @@ The board uses a 1-dimensional representation with padding
 import numpy as np
 from board_util import GoBoardUtil, BLACK, WHITE, EMPTY, BORDER, \
                        PASS, is_black_white, coord_to_point, where1d, MAXSIZE
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _check_five(board, point, color, NS):
+    """
+    Check whether the stone of color on point is part of five in a row.
+    Scans at most 4 points on each side of point along the strides
+    horizontal (1), vertical (NS) and the two diagonals (NS + 1 and
+    NS - 1).
+    No range check is needed: the BORDER padding stops every scan
+    before it can leave the array.
+    Returns as soon as a five is found.
+    """
+    for s in (1, NS, NS + 1, NS - 1):
+        count = 1
+        for k in range(1, 5):
+            if board[point + k * s] == color:
+                count += 1
+            else:
+                break
+        if count >= 5:
+            return True
+        for k in range(1, 5):
+            if board[point - k * s] == color:
+                count += 1
+            else:
+                break
+        if count >= 5:
+            return True
+    return False
+
+if njit is not None:
+    _check_five = njit(cache=True, boundscheck=False)(_check_five)
 
 class SimpleGoBoard(object):
 
@@ -24,12 +59,13 @@ class SimpleGoBoard(object):
     def is_legal(self, point, color):
         """
         Check whether it is legal for color to play on point
+        Mirrors the checks in play_move without copying the board:
+        there are no captures or suicide, so only occupancy matters
         """
-        board_copy = self.copy()
-        # Try to play the move on a temporary copy of board
-        # This prevents the board from being messed up by the move
-        legal = board_copy.play_move(point, color)
-        return legal
+        assert is_black_white(color)
+        if point == PASS:
+            return True
+        return bool(self.board[point] == EMPTY)
 
     def get_empty_points(self):
         """
@@ -57,19 +93,48 @@ class SimpleGoBoard(object):
         self.ko_recapture = None
         self.current_player = BLACK
         self.maxpoint = size * size + 3 * (size + 1)
-        self.board = np.full(self.maxpoint, BORDER, dtype = np.int32)
+        self.board = np.full(self.maxpoint, BORDER, dtype = np.int8)
         self._initialize_empty_points(self.board) 
+        # Scratch markers for _block_of, allocated on first use
+        self._block_gen = None
+        self._cur_gen = 0
+        if njit is None:
+            # Strides of the four lines through a point: horizontal,
+            # vertical and the two diagonals
+            self._dirs = (1, self.NS, self.NS + 1, self.NS - 1)
+            # Bitboards of the stones of each color, indexed by color,
+            # only needed for the win check without numba.
+            # Bit i is set iff point i holds a stone of that color.
+            # BORDER bits are always 0, so shifted lines cannot wrap
+            # from one row into the next
+            self._bb = [0, 0, 0]
+            # Bits 0, d, 2d, 3d and 4d: the possible start points of a
+            # five along stride d, relative to point - 4d
+            self._five_masks = tuple(sum(1 << (k * d) for k in range(5))
+                                     for d in self._dirs)
         self.winner = None
 
     def copy(self):
-        b = SimpleGoBoard(self.size)
-        b.winner = self.winner
-        assert b.NS == self.NS
-        assert b.WE == self.WE
+        """
+        Return a copy of the board
+        Bypasses __init__, since reset would build an empty board
+        only to have it overwritten
+        """
+        b = SimpleGoBoard.__new__(SimpleGoBoard)
+        b.size = self.size
+        b.NS = self.NS
+        b.WE = self.WE
         b.ko_recapture = self.ko_recapture
         b.current_player = self.current_player
-        assert b.maxpoint == self.maxpoint
-        b.board = np.copy(self.board)
+        b.maxpoint = self.maxpoint
+        b.board = self.board.copy()
+        b._block_gen = None
+        b._cur_gen = 0
+        if njit is None:
+            b._dirs = self._dirs
+            b._bb = list(self._bb)
+            b._five_masks = self._five_masks
+        b.winner = self.winner
         return b
 
     def row_start(self, row):
@@ -83,10 +148,11 @@ class SimpleGoBoard(object):
         Argument
         ---------
         board: numpy array, filled with BORDER
+        Rows 1..size are viewed as a (size, NS) array whose first column
+        is the BORDER point separating consecutive rows
         """
-        for row in range(1, self.size + 1):
-            start = self.row_start(row)
-            board[start : start + self.size] = EMPTY
+        rows = board[self.NS : self.NS * (self.size + 1)]
+        rows.reshape(self.size, self.NS)[:, 1:] = EMPTY
 
     def is_eye(self, point, color):
         """
@@ -96,12 +162,13 @@ class SimpleGoBoard(object):
             return False
         # Eye-like shape. Check diagonals to detect false eye
         opp_color = GoBoardUtil.opponent(color)
+        board = self.board
         false_count = 0
         at_edge = 0
         for d in self._diag_neighbors(point):
-            if self.board[d] == BORDER:
+            if board[d] == BORDER:
                 at_edge = 1
-            elif self.board[d] == opp_color:
+            elif board[d] == opp_color:
                 false_count += 1
         return false_count <= 1 - at_edge # 0 at edge, 1 in center
     
@@ -109,42 +176,53 @@ class SimpleGoBoard(object):
         """
         check whether empty point is surrounded by stones of color.
         """
+        board = self.board
         for nb in self._neighbors(point):
-            nb_color = self.board[nb]
+            nb_color = board[nb]
             if nb_color != BORDER and nb_color != color:
                 return False
         return True
 
-    def _has_liberty(self, block):
+    def _has_liberty(self, block_points):
         """
         Check if the given block has any liberty.
-        block is a numpy boolean array
+        block_points is an iterable of the points in the block
         """
-        for stone in where1d(block):
-            empty_nbs = self.neighbors_of_color(stone, EMPTY)
-            if empty_nbs:
+        board = self.board
+        NS = self.NS
+        for p in block_points:
+            if board[p - 1] == EMPTY or board[p + 1] == EMPTY or \
+               board[p - NS] == EMPTY or board[p + NS] == EMPTY:
                 return True
         return False
 
     def _block_of(self, stone):
         """
         Find the block of given stone
-        Returns a board of boolean markers which are set for
-        all the points in the block 
+        Returns a list of all the points in the block
+        Visited points are marked with a new generation number in
+        self._block_gen, so the markers never need to be cleared
         """
-        marker = np.full(self.maxpoint, False, dtype = bool)
+        if self._block_gen is None:
+            self._block_gen = np.zeros(self.maxpoint, dtype = np.int32)
+        self._cur_gen += 1
+        gen = self._cur_gen
+        block_gen = self._block_gen
+        board = self.board
+        NS = self.NS
         pointstack = [stone]
-        color = self.get_color(stone)
+        block = [stone]
+        color = board[stone]
         assert is_black_white(color)
-        marker[stone] = True
+        block_gen[stone] = gen
         while pointstack:
             p = pointstack.pop()
-            neighbors = self.neighbors_of_color(p, color)
-            for nb in neighbors:
-                if not marker[nb]:
-                    marker[nb] = True
+            for nb in (p - 1, p + 1, p - NS, p + NS):
+                if board[nb] == color and block_gen[nb] != gen:
+                    block_gen[nb] = gen
                     pointstack.append(nb)
-        return marker
+                    block.append(nb)
+        return block
 
     def _detect_and_process_capture(self, nb_point):
         """
@@ -156,9 +234,13 @@ class SimpleGoBoard(object):
         single_capture = None 
         opp_block = self._block_of(nb_point)
         if not self._has_liberty(opp_block):
-            captures = list(where1d(opp_block))
-            self.board[captures] = EMPTY
-            if len(captures) == 1:
+            board = self.board
+            opp_color = board[nb_point]
+            board[opp_block] = EMPTY
+            if njit is None:
+                for stone in opp_block:
+                    self._bb[opp_color] &= ~(1 << int(stone))
+            if len(opp_block) == 1:
                 single_capture = nb_point
         return single_capture
 
@@ -197,107 +279,46 @@ class SimpleGoBoard(object):
         #if in_enemy_eye and len(single_captures) == 1:
             #self.ko_recapture = single_captures[0]
         
-        #check vertical winner   
-        count = -1
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location += 1
-                else:
-                    break
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location -= 1
-                else:
-                    break                
-        if count >= 5:
+        if njit is not None:
+            won = _check_five(self.board, point, color, self.NS)
+        else:
+            self._bb[color] |= 1 << int(point)
+            won = self._bitboard_five(point, color)
+        if won:
             self.winner = color
-            
-        #check horizental winner
-        count = -1
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location += (self.size+1)
-                else:
-                    break
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location -= (self.size+1)
-                else:
-                    break                
-        if count >= 5:
-            self.winner = color        
-        #check diag from top left to down right
-        count = -1
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location += (self.size+2)
-                else:
-                    break
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location -= (self.size+2)
-                else:
-                    break                
-        if count >= 5:
-            self.winner = color         
-        
-        #check diag from top right to down left
-        count = -1
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location += self.size
-                else:
-                    break
-        location = point
-        for i in range(5):
-            if location > 0 and location < len(self.board):
-                if self.board[location] == color :
-                    count += 1
-                    location -= self.size
-                else:
-                    break                
-        if count >= 5:
-            self.winner = color            
         
         self.current_player = GoBoardUtil.opponent(color)
         return True
 
+    def _bitboard_five(self, point, color):
+        """
+        Bitboard version of _check_five, used when numba is not available.
+        For stride d, x has bit i set iff points i, i+d, ..., i+4d all
+        hold stones of color. Only fives through point are counted.
+        """
+        bb = self._bb[color]
+        for d, mask in zip(self._dirs, self._five_masks):
+            x = bb & (bb >> d)
+            x &= x >> (2 * d)
+            x &= bb >> (4 * d)
+            shift = int(point) - 4 * d
+            x = x >> shift if shift >= 0 else x << -shift
+            if x & mask:
+                return True
+        return False
+
     def neighbors_of_color(self, point, color):
         """ List of neighbors of point of given color """
-        nbc = []
-        for nb in self._neighbors(point):
-            if self.get_color(nb) == color:
-                nbc.append(nb)
-        return nbc
+        board = self.board
+        return [nb for nb in self._neighbors(point) if board[nb] == color]
         
     def _neighbors(self, point):
-        """ List of all four neighbors of the point """
-        return [point - 1, point + 1, point - self.NS, point + self.NS]
+        """ Tuple of all four neighbors of the point """
+        return (point - 1, point + 1, point - self.NS, point + self.NS)
 
     def _diag_neighbors(self, point):
-        """ List of all four diagonal neighbors of point """
-        return [point - self.NS - 1, 
+        """ Tuple of all four diagonal neighbors of point """
+        return (point - self.NS - 1, 
                 point - self.NS + 1, 
                 point + self.NS - 1, 
-                point + self.NS + 1]
+                point + self.NS + 1)
@@ -3,8 +3,10 @@
 # Set the path to your python3 above
 
 import unittest
+from unittest import mock
 import numpy as np
-from board_util import BLACK, WHITE, EMPTY, BORDER, PASS, where1d
+from board_util import BLACK, WHITE, EMPTY, BORDER, PASS, where1d, GoBoardUtil
+import simple_board
 from simple_board import SimpleGoBoard
 
 class SimpleGoBoardTestCase(unittest.TestCase):
@@ -49,6 +51,155 @@ class SimpleGoBoardTestCase(unittest.TestCase):
         count = count_colors(goboard)
         self.assertEqual(count, [size * size - 1, 1, 0, 3 * (size + 1)])
 
+    def test_is_legal(self):
+        goboard = SimpleGoBoard(3)
+        point = goboard.pt(2,2)
+        self.assertIs(goboard.is_legal(point, BLACK), True)
+        goboard.play_move(point, BLACK)
+        self.assertIs(goboard.is_legal(point, WHITE), False)
+        self.assertTrue(goboard.is_legal(PASS, WHITE))
+        count = count_colors(goboard)
+        self.assertEqual(count, [8, 1, 0, 3 * 4])
+
+    def test_copy(self):
+        goboard = SimpleGoBoard(7)
+        for col in range(1, 5):
+            goboard.play_move(goboard.pt(4, col), BLACK)
+        goboard.current_player = WHITE
+        copy = goboard.copy()
+        self.assertEqual(vars(copy).keys(), vars(SimpleGoBoard(7)).keys())
+        self.assertEqual(list(copy.board), list(goboard.board))
+        self.assertEqual(copy.current_player, WHITE)
+        copy.play_move(copy.pt(4, 5), BLACK)
+        self.assertEqual(copy.winner, BLACK)
+        self.assertEqual(goboard.winner, None)
+        self.assertEqual(goboard.get_color(goboard.pt(4, 5)), EMPTY)
+
+    def test_get_empty_points(self):
+        goboard = SimpleGoBoard(3)
+        all_points = [goboard.pt(row, col)
+                      for row in range(1, 4) for col in range(1, 4)]
+        self.assertEqual(list(goboard.get_empty_points()), all_points)
+        goboard.play_move(goboard.pt(2,2), BLACK)
+        copy = goboard.copy()
+        goboard.play_move(goboard.pt(1,1), WHITE)
+        self.assertEqual(list(goboard.get_empty_points()),
+                         [p for p in all_points
+                          if p not in (goboard.pt(2,2), goboard.pt(1,1))])
+        self.assertEqual(list(copy.get_empty_points()),
+                         [p for p in all_points if p != goboard.pt(2,2)])
+
+    def test_neighbors_of_color(self):
+        goboard = SimpleGoBoard(3)
+        center = goboard.pt(2,2)
+        goboard.play_move(goboard.pt(1,2), BLACK)
+        goboard.play_move(goboard.pt(2,3), WHITE)
+        self.assertEqual(goboard.neighbors_of_color(center, BLACK),
+                         [goboard.pt(1,2)])
+        self.assertEqual(goboard.neighbors_of_color(center, EMPTY),
+                         [goboard.pt(2,1), goboard.pt(3,2)])
+        self.assertEqual(goboard.neighbors_of_color(goboard.pt(1,1), BORDER),
+                         [goboard.pt(1,1) - 1, goboard.pt(1,1) - goboard.NS])
+
+    def test_block_of(self):
+        goboard = SimpleGoBoard(3)
+        for row, col in [(1,1), (1,2), (2,2), (3,3)]:
+            goboard.play_move(goboard.pt(row, col), BLACK)
+        block = goboard._block_of(goboard.pt(1,1))
+        self.assertEqual(sorted(block),
+                         [goboard.pt(1,1), goboard.pt(1,2), goboard.pt(2,2)])
+        self.assertEqual(goboard._block_of(goboard.pt(3,3)), [goboard.pt(3,3)])
+        self.assertEqual(len(goboard._block_of(goboard.pt(2,2))), 3)
+
+    def do_test_capture(self):
+        goboard = SimpleGoBoard(3)
+        goboard.play_move(goboard.pt(1,1), WHITE)
+        goboard.play_move(goboard.pt(1,2), BLACK)
+        self.assertTrue(goboard._has_liberty(goboard._block_of(goboard.pt(1,1))))
+        goboard.play_move(goboard.pt(2,1), BLACK)
+        self.assertFalse(goboard._has_liberty(goboard._block_of(goboard.pt(1,1))))
+        captured = goboard._detect_and_process_capture(goboard.pt(1,1))
+        self.assertEqual(captured, goboard.pt(1,1))
+        self.assertEqual(goboard.get_color(goboard.pt(1,1)), EMPTY)
+        self.assertIn(goboard.pt(1,1), goboard.get_empty_points())
+        return goboard
+
+    def test_capture(self):
+        self.do_test_capture()
+
+    def test_capture_bitboard(self):
+        with mock.patch.object(simple_board, 'njit', None):
+            goboard = self.do_test_capture()
+        self.assertEqual(goboard._bb[WHITE], 0)
+        self.assertEqual(goboard._bb[BLACK],
+                         1 << goboard.pt(1,2) | 1 << goboard.pt(2,1))
+
+    def test_is_eye(self):
+        goboard = SimpleGoBoard(5)
+        corner = goboard.pt(1,1)
+        center = goboard.pt(3,3)
+        self.assertFalse(goboard.is_eye(corner, BLACK))
+        goboard.play_move(goboard.pt(1,2), BLACK)
+        goboard.play_move(goboard.pt(2,1), BLACK)
+        self.assertTrue(goboard.is_eye(corner, BLACK))
+        self.assertFalse(goboard.is_eye(corner, WHITE))
+        goboard.play_move(goboard.pt(2,2), WHITE)
+        self.assertFalse(goboard.is_eye(corner, BLACK))
+        for row, col in [(2,3), (3,2), (3,4), (4,3)]:
+            goboard.play_move(goboard.pt(row, col), BLACK)
+        self.assertTrue(goboard.is_eye(center, BLACK))
+        goboard.play_move(goboard.pt(4,4), WHITE)
+        self.assertFalse(goboard.is_eye(center, BLACK))
+
+    def do_test_winner(self, coords, winner):
+        goboard = SimpleGoBoard(7)
+        for row, col in coords:
+            goboard.play_move(goboard.pt(row, col), BLACK)
+        self.assertEqual(goboard.winner, winner)
+
+    def test_winner_horizontal(self):
+        self.do_test_winner([(4, col) for col in range(3, 8)], BLACK)
+
+    def test_winner_vertical(self):
+        self.do_test_winner([(row, 1) for row in range(1, 6)], BLACK)
+
+    def test_winner_diagonals(self):
+        self.do_test_winner([(i, i) for i in range(3, 8)], BLACK)
+        self.do_test_winner([(i, 8 - i) for i in range(1, 6)], BLACK)
+
+    def test_winner_middle_stone(self):
+        self.do_test_winner([(2, 1), (2, 2), (2, 4), (2, 5), (2, 3)], BLACK)
+
+    def test_no_winner_four(self):
+        self.do_test_winner([(7, col) for col in range(4, 8)], None)
+
+    def test_no_winner_across_rows(self):
+        self.do_test_winner([(1, 5), (1, 6), (1, 7), (2, 1), (2, 2)], None)
+
+    def do_test_winner_random_games(self):
+        np.random.seed(496)
+        for _ in range(20):
+            goboard = SimpleGoBoard(7)
+            color = BLACK
+            for move in np.random.permutation(goboard.get_empty_points()):
+                goboard.play_move(move, color)
+                won = has_five(goboard, color)
+                self.assertEqual(goboard.winner, color if won else None)
+                if won:
+                    break
+                color = WHITE + BLACK - color
+
+    def test_winner_random_games(self):
+        self.do_test_winner_random_games()
+
+    def test_winner_random_games_bitboard(self):
+        with mock.patch.object(simple_board, 'njit', None), \
+             mock.patch.object(SimpleGoBoard, '_bitboard_five', autospec = True,
+                               side_effect = SimpleGoBoard._bitboard_five) \
+                as bitboard_five:
+            self.do_test_winner_random_games()
+        self.assertTrue(bitboard_five.called)
+
 """Utility"""
 def count_colors(goboard):
     count = []
@@ -57,6 +208,19 @@ def count_colors(goboard):
         count.append(len(points_in_color))
     return count
 
+def has_five(goboard, color):
+    board2d = GoBoardUtil.get_twoD_board(goboard) == color
+    size = goboard.size
+    for row in range(size):
+        for col in range(size):
+            for drow, dcol in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                if all(0 <= row + k * drow < size and
+                       0 <= col + k * dcol < size and
+                       board2d[row + k * drow, col + k * dcol]
+                       for k in range(5)):
+                    return True
+    return False
+
 """Main"""
 if __name__ == '__main__':
     unittest.main()